@@ -0,0 +1,28 @@
+import os
+from pathlib import Path
+
+APP_DIR_NAME = "RPGMakerSaveEditor"
+
+
+def _ensure(path, parts):
+    path = path.joinpath(*parts)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def cache_dir(*parts):
+    base = os.environ.get("LOCALAPPDATA")
+    if base:
+        path = Path(base) / APP_DIR_NAME / "cache"
+    else:
+        path = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / APP_DIR_NAME
+    return _ensure(path, parts)
+
+
+def data_dir(*parts):
+    base = os.environ.get("APPDATA")
+    if base:
+        path = Path(base) / APP_DIR_NAME
+    else:
+        path = Path(os.environ.get("XDG_DATA_HOME", Path.home() / ".local" / "share")) / APP_DIR_NAME
+    return _ensure(path, parts)
@@ -0,0 +1,387 @@
+import os
+import json
+import inspect
+import argparse
+import threading
+from fnmatch import fnmatchcase
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from save_codecs import decode_save, serialize_data, write_save_file
+from data_diff import MISSING, diff_values
+from snapshots import SnapshotStore
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_CACHE_SIZE = 16
+DEFAULT_RESULT_LIMIT = 1000
+
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+SERVER_ERROR = -32000
+
+
+class RpcError(Exception):
+    def __init__(self, code, message):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+class Document:
+    def __init__(self, path, mtime, size, codec, data):
+        self.path = path
+        self.mtime = mtime
+        self.size = size
+        self.codec = codec
+        self.data = data
+        self.dirty = False
+
+
+class DocumentCache:
+    def __init__(self, max_entries=DEFAULT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._documents = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, path):
+        path = os.path.abspath(path)
+        try:
+            stat = os.stat(path)
+        except OSError as e:
+            raise RpcError(SERVER_ERROR, f"Cannot read {path}: {e.strerror}")
+
+        document = self._documents.get(path)
+        if document and document.mtime == stat.st_mtime_ns and document.size == stat.st_size:
+            self._documents.move_to_end(path)
+            self.hits += 1
+            return document
+        if document and document.dirty:
+            raise RpcError(SERVER_ERROR, f"{path} changed on disk and has unsaved changes; close it first")
+
+        self.misses += 1
+        with open(path, "rb") as f:
+            raw_data = f.read()
+        try:
+            codec, decompressed = decode_save(raw_data, path)
+            data = json.loads(decompressed)
+        except ValueError as e:
+            raise RpcError(SERVER_ERROR, f"Cannot decode {path}: {str(e)}")
+
+        document = Document(path, stat.st_mtime_ns, stat.st_size, codec, data)
+        self._documents[path] = document
+        self._documents.move_to_end(path)
+        self._evict()
+        return document
+
+    def _evict(self):
+        # Documents with unsaved changes are never evicted.
+        while len(self._documents) > self.max_entries:
+            for path, document in self._documents.items():
+                if not document.dirty:
+                    del self._documents[path]
+                    break
+            else:
+                return
+
+    def refresh_stat(self, document):
+        stat = os.stat(document.path)
+        document.mtime = stat.st_mtime_ns
+        document.size = stat.st_size
+
+    def close(self, path):
+        return self._documents.pop(os.path.abspath(path), None) is not None
+
+    def stats(self):
+        return {
+            "cached": list(self._documents),
+            "hits": self.hits,
+            "misses": self.misses,
+            "max_entries": self.max_entries,
+        }
+
+
+def check_param(name, value, *types):
+    # bool is an int subclass, so compare exact types to keep true out of limits.
+    if type(value) not in types:
+        expected = " or ".join("null" if t is type(None) else t.__name__ for t in types)
+        raise RpcError(INVALID_PARAMS, f"{name} must be {expected}")
+    return value
+
+
+def check_limit(limit):
+    if check_param("limit", limit, int) < 1:
+        raise RpcError(INVALID_PARAMS, "limit must be a positive integer")
+
+
+def parse_path(path):
+    if path is None or path == "":
+        return []
+    if isinstance(path, str):
+        return [step for step in path.split("/") if step != ""]
+    if isinstance(path, list):
+        for step in path:
+            check_param("path steps", step, str, int)
+        return path
+    raise RpcError(INVALID_PARAMS, "path must be a '/'-separated string or a list")
+
+
+def resolve(data, path):
+    current = data
+    for i, step in enumerate(path):
+        if isinstance(current, dict):
+            if str(step) not in current:
+                raise RpcError(SERVER_ERROR, f"Key '{step}' not found at position {i}")
+            current = current[str(step)]
+        elif isinstance(current, list):
+            try:
+                idx = int(step)
+            except (TypeError, ValueError):
+                raise RpcError(SERVER_ERROR, f"Invalid list index '{step}' at position {i}")
+            if idx >= len(current) or idx < 0:
+                raise RpcError(SERVER_ERROR, f"Index {idx} out of range at position {i}")
+            current = current[idx]
+        else:
+            raise RpcError(SERVER_ERROR, f"Unexpected {type(current).__name__} at position {i}")
+    return current
+
+
+def encode_change(path, old, new):
+    change = {"path": list(path)}
+    if old is not MISSING:
+        change["old"] = old
+    if new is not MISSING:
+        change["new"] = new
+    return change
+
+
+def walk_paths(value, path=()):
+    yield path, value
+    if isinstance(value, dict):
+        for key, child in value.items():
+            yield from walk_paths(child, path + (key,))
+    elif isinstance(value, list):
+        for index, child in enumerate(value):
+            yield from walk_paths(child, path + (index,))
+
+
+class AutomationService:
+    def __init__(self, cache_size=DEFAULT_CACHE_SIZE, snapshots=True):
+        self.cache = DocumentCache(cache_size)
+        self.snapshot_store = SnapshotStore() if snapshots else None
+        self.lock = threading.Lock()
+        self.methods = {
+            "get": self.get,
+            "set": self.set,
+            "query": self.query,
+            "diff": self.diff,
+            "save": self.save,
+            "close": self.close,
+            "stats": self.stats,
+        }
+
+    def call(self, method, params):
+        handler = self.methods.get(method)
+        if handler is None:
+            raise RpcError(METHOD_NOT_FOUND, f"Unknown method '{method}'")
+        if isinstance(params, list):
+            args, kwargs = params, {}
+        elif isinstance(params, dict):
+            args, kwargs = [], params
+        else:
+            raise RpcError(INVALID_PARAMS, "params must be an object or an array")
+        try:
+            inspect.signature(handler).bind(*args, **kwargs)
+        except TypeError as e:
+            raise RpcError(INVALID_PARAMS, str(e))
+        with self.lock:
+            return handler(*args, **kwargs)
+
+    def get(self, file, path=None):
+        check_param("file", file, str)
+        return resolve(self.cache.get(file).data, parse_path(path))
+
+    def set(self, file, path, value):
+        check_param("file", file, str)
+        document = self.cache.get(file)
+        steps = parse_path(path)
+        if not steps:
+            raise RpcError(INVALID_PARAMS, "Cannot replace the document root")
+        container = resolve(document.data, steps[:-1])
+        key = steps[-1]
+        if not isinstance(container, (dict, list)):
+            raise RpcError(SERVER_ERROR, f"Cannot set a value inside {type(container).__name__}")
+        # Like get, only existing keys are accepted; set never adds new ones.
+        old_value = resolve(document.data, steps)
+        key = int(key) if isinstance(container, list) else str(key)
+        container[key] = value
+        document.dirty = document.dirty or old_value != value
+        return {"old": old_value, "new": value, "dirty": document.dirty}
+
+    def query(self, file, pattern, path=None, limit=DEFAULT_RESULT_LIMIT, containers=False):
+        check_param("file", file, str)
+        check_param("pattern", pattern, str)
+        check_limit(limit)
+        check_param("containers", containers, bool)
+        root_path = tuple(parse_path(path))
+        root = resolve(self.cache.get(file).data, root_path)
+        matches = []
+        for sub_path, value in walk_paths(root, root_path):
+            if not containers and isinstance(value, (dict, list)):
+                continue
+            if fnmatchcase('/'.join(str(step) for step in sub_path), pattern):
+                matches.append({"path": list(sub_path), "value": value})
+                if len(matches) >= limit:
+                    break
+        return matches
+
+    def diff(self, file, other=None, path=None, limit=DEFAULT_RESULT_LIMIT):
+        check_param("file", file, str)
+        check_param("other", other, str, type(None))
+        check_limit(limit)
+        steps = parse_path(path)
+        document = self.cache.get(file)
+        if other is None:
+            # Compare unsaved changes against the file on disk.
+            with open(document.path, "rb") as f:
+                _, decompressed = decode_save(f.read(), document.path)
+            old_root = resolve(json.loads(decompressed), steps)
+        else:
+            old_root = resolve(self.cache.get(other).data, steps)
+        new_root = resolve(document.data, steps)
+
+        changes = []
+        for change_path, old, new in diff_values(old_root, new_root, tuple(steps)):
+            changes.append(encode_change(change_path, old, new))
+            if len(changes) >= limit:
+                break
+        return changes
+
+    def save(self, file, force=False):
+        check_param("file", file, str)
+        check_param("force", force, bool)
+        document = self.cache.get(file)
+        if not document.dirty and not force:
+            return {"saved": False}
+        json_data = serialize_data(document.data)
+        write_save_file(document.path, document.codec, json_data)
+        document.dirty = False
+        self.cache.refresh_stat(document)
+        if self.snapshot_store:
+            # Recorded outside the service lock so other calls do not wait on it.
+            threading.Thread(
+                target=self.record_snapshot, args=(document.path, json_data, document.codec.name)
+            ).start()
+        return {"saved": True, "codec": document.codec.name}
+
+    def record_snapshot(self, path, json_data, codec_name):
+        try:
+            self.snapshot_store.record(path, json_data, codec_name, "Automation")
+        except Exception as e:
+            print(f"Snapshot error: {str(e)}")
+
+    def close(self, file):
+        check_param("file", file, str)
+        return self.cache.close(file)
+
+    def stats(self):
+        return self.cache.stats()
+
+    def handle(self, request):
+        if isinstance(request, list):
+            if not request:
+                return self.error_response(None, RpcError(INVALID_REQUEST, "Empty batch"))
+            responses = [self.handle(entry) for entry in request]
+            # A batch of notifications gets no response at all.
+            return [response for response in responses if response is not None] or None
+
+        if not isinstance(request, dict) or request.get("jsonrpc") != "2.0" or "method" not in request:
+            return self.error_response(None, RpcError(INVALID_REQUEST, "Invalid JSON-RPC request"))
+
+        request_id = request.get("id")
+        try:
+            result = self.call(request["method"], request.get("params", {}))
+        except RpcError as e:
+            response = self.error_response(request_id, e)
+        except Exception as e:
+            response = self.error_response(request_id, RpcError(SERVER_ERROR, str(e)))
+        else:
+            response = {"jsonrpc": "2.0", "id": request_id, "result": result}
+        # Notifications are never answered, even when they fail.
+        return response if "id" in request else None
+
+    def error_response(self, request_id, error):
+        return {"jsonrpc": "2.0", "id": request_id, "error": {"code": error.code, "message": error.message}}
+
+
+class RpcRequestHandler(BaseHTTPRequestHandler):
+    service = None
+
+    def is_trusted_request(self):
+        # Browsers send Origin with every POST and can submit text/plain forms
+        # without a preflight, so a web page (even one reached through DNS
+        # rebinding) cannot drive the server.
+        if self.headers.get("Origin") is not None:
+            self.send_error(403, "Browser requests are not allowed")
+            return False
+        content_type = self.headers.get("Content-Type", "").split(";", 1)[0].strip().lower()
+        if content_type != "application/json":
+            self.send_error(415, "Content-Type must be application/json")
+            return False
+        return True
+
+    def do_POST(self):
+        if not self.is_trusted_request():
+            return
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            request = json.loads(self.rfile.read(length).decode("utf-8"))
+        except ValueError as e:
+            response = self.service.error_response(None, RpcError(PARSE_ERROR, str(e)))
+        else:
+            response = self.service.handle(request)
+
+        if response is None:
+            self.send_response(204)
+            self.end_headers()
+            return
+        body = json.dumps(response, ensure_ascii=False).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def create_server(host=DEFAULT_HOST, port=DEFAULT_PORT, cache_size=DEFAULT_CACHE_SIZE, snapshots=True):
+    handler = type("BoundRpcRequestHandler", (RpcRequestHandler,), {
+        "service": AutomationService(cache_size, snapshots)
+    })
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless JSON-RPC server for RPG Maker save files")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_CACHE_SIZE)
+    parser.add_argument("--no-snapshots", action="store_true", help="Do not record saves in the snapshot history")
+    args = parser.parse_args()
+
+    server = create_server(args.host, args.port, args.cache_size, not args.no_snapshots)
+    print(f"Automation server listening on http://{args.host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+from PySide6.QtCore import QThread, Signal
+from save_codecs import write_save_file
+
+AUTOSAVE_DELAY_MS = 3000
+
+
+class SaveWorker(QThread):
+    saved = Signal(str, int, str, str)
+    error_occurred = Signal(str)
+
+    def __init__(self, path, codec, json_data, generation, data_hash, snapshot_store=None):
+        super().__init__()
+        self.path = path
+        self.codec = codec
+        self.json_data = json_data
+        self.generation = generation
+        self.data_hash = data_hash
+        self.snapshot_store = snapshot_store
+
+    def run(self):
+        try:
+            write_save_file(self.path, self.codec, self.json_data)
+        except Exception as e:
+            self.error_occurred.emit(f"Autosave failed: {str(e)}")
+            return
+
+        if self.snapshot_store:
+            try:
+                self.snapshot_store.record(self.path, self.json_data, self.codec.name, "Autosaved")
+            except Exception as e:
+                print(f"Snapshot error: {str(e)}")
+
+        self.saved.emit(self.path, self.generation, self.data_hash, self.json_data)
+
+
+class SnapshotWorker(QThread):
+    def __init__(self, snapshot_store, path, json_data, codec_name, label):
+        super().__init__()
+        self.snapshot_store = snapshot_store
+        self.path = path
+        self.json_data = json_data
+        self.codec_name = codec_name
+        self.label = label
+
+    def run(self):
+        try:
+            self.snapshot_store.record(self.path, self.json_data, self.codec_name, self.label)
+        except Exception as e:
+            print(f"Snapshot error: {str(e)}")
@@ -0,0 +1,87 @@
+import json
+
+MISSING = object()
+
+
+def diff_values(old, new, path=()):
+    if old is new:
+        return
+    if isinstance(old, dict) and isinstance(new, dict):
+        for key, value in old.items():
+            yield from diff_values(value, new.get(key, MISSING), path + (key,))
+        for key, value in new.items():
+            if key not in old:
+                yield path + (key,), MISSING, value
+    elif isinstance(old, list) and isinstance(new, list):
+        for index in range(max(len(old), len(new))):
+            old_value = old[index] if index < len(old) else MISSING
+            new_value = new[index] if index < len(new) else MISSING
+            yield from diff_values(old_value, new_value, path + (index,))
+    elif type(old) is not type(new) or old != new:
+        yield path, old, new
+
+
+def format_path(path):
+    return ' → '.join(str(step) for step in path) or "(root)"
+
+
+def format_value(value, limit=80):
+    if value is MISSING:
+        return "(missing)"
+    text = repr(value) if not isinstance(value, (dict, list)) else f"[{type(value).__name__.capitalize()}: {len(value)} entries]"
+    return text if len(text) <= limit else text[:limit - 1] + "…"
+
+
+def excerpt(value, limit=2000, max_items=20, max_depth=3):
+    def shrink(node, depth):
+        if isinstance(node, dict):
+            if depth >= max_depth:
+                return f"[Dict: {len(node)} entries]"
+            shrunk = {}
+            for i, (key, child) in enumerate(node.items()):
+                if i >= max_items:
+                    shrunk["…"] = f"{len(node) - max_items} more entries"
+                    break
+                shrunk[key] = shrink(child, depth + 1)
+            return shrunk
+        if isinstance(node, list):
+            if depth >= max_depth:
+                return f"[List: {len(node)} entries]"
+            shrunk = [shrink(child, depth + 1) for child in node[:max_items]]
+            if len(node) > max_items:
+                shrunk.append(f"… {len(node) - max_items} more entries")
+            return shrunk
+        if isinstance(node, str) and len(node) > 200:
+            return node[:200] + "…"
+        return node
+
+    text = json.dumps(shrink(value, 0), indent=2, ensure_ascii=False, default=str)
+    return text if len(text) <= limit else text[:limit] + "\n…"
+
+
+def format_change(path, old, new):
+    return f"{format_path(path)}: {format_value(old)} → {format_value(new)}"
+
+
+def apply_change(root, path, value):
+    container = root
+    for step in path[:-1]:
+        container = container[step]
+    key = path[-1]
+    if value is MISSING:
+        if isinstance(container, list):
+            container.pop(key)
+        else:
+            del container[key]
+    elif isinstance(container, list) and key == len(container):
+        container.append(value)
+    else:
+        container[key] = value
+
+
+def overlapping_paths(paths, other_paths):
+    other_set = set(other_paths)
+    other_prefixes = {path[:i] for path in other_paths for i in range(len(path) + 1)}
+    for path in paths:
+        if path in other_prefixes or any(path[:i] in other_set for i in range(len(path))):
+            yield path
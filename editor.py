@@ -1,14 +1,12 @@
 import os
 import json
-import shutil
 from pathlib import Path
-from lzstring import LZString
 from PySide6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QTreeWidget,
     QTreeWidgetItem, QPushButton, QFileDialog, QMessageBox, QToolBar,
     QStyle, QLabel, QScrollArea, QApplication, QToolButton
 )
-from PySide6.QtGui import QClipboard, QKeySequence, QAction, QPixmap, QIcon, QColor, QPainter
+from PySide6.QtGui import QClipboard, QKeySequence, QAction, QPixmap, QIcon, QColor, QPainter, QBrush
 from PySide6.QtCore import (
     Qt, QObject, QByteArray, Signal, QPropertyAnimation, QEasingCurve,
     QEvent, QTimer, QPoint
@@ -16,6 +14,23 @@ from PySide6.QtCore import (
 from PySide6.QtSvg import QSvgRenderer
 from PySide6.QtGui import QImage
 from game_detection import GameDetectionDialog
+from save_codecs import (
+    decode_save, file_dialog_filter, content_hash, serialize_data, write_save_file
+)
+from game_database import GameDatabase
+from snapshots import SnapshotStore
+from history_dialog import SnapshotHistoryDialog
+from autosave import AUTOSAVE_DELAY_MS, SaveWorker, SnapshotWorker
+from live_reload import ReloadWorker, SaveFileWatcher
+from data_diff import (
+    MISSING, apply_change, excerpt, format_change, format_path, format_value, overlapping_paths
+)
+from size_profile import ProfileWorker, format_size
+
+MAX_CONFLICT_LINES = 20
+SIZE_COLUMN = 2
+COMPRESSED_COLUMN = 3
+NODES_COLUMN = 4
 
 
 class Command:
@@ -42,8 +57,20 @@ class SafeTreeWidgetItem(QTreeWidgetItem):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.original_key = ""
+        self.container = None
+        self.data_key = None
+        self.sort_index = 0
         self.setFlags(self.flags() | Qt.ItemIsEditable)
 
+    def __lt__(self, other):
+        tree = self.treeWidget()
+        column = tree.sortColumn() if tree else 0
+        if column >= SIZE_COLUMN:
+            return (self.data(column, Qt.UserRole) or 0) < (other.data(column, Qt.UserRole) or 0)
+        if column == 0 and isinstance(other, SafeTreeWidgetItem):
+            return self.sort_index < other.sort_index
+        return super().__lt__(other)
+
 
 class SaveFileEditor(QMainWindow):
     def __init__(self):
@@ -53,7 +80,34 @@ class SaveFileEditor(QMainWindow):
             self.setWindowIcon(QIcon(str(icon_path)))
         self.current_file = ""
         self.data = {}
-        self.lz = LZString()
+        self.codec = None
+        self.game_db = None
+        self.snapshot_store = None
+        self.history_dialog = None
+        self.snapshot_workers = []
+        self.generation = 0
+        self.saved_generation = 0
+        self.load_generation = 0
+        self.saved_hash = None
+        self.autosave_enabled = False
+        self.save_worker = None
+        self.base_json = None
+        self.pending_save_hash = None
+        self.live_reload_enabled = True
+        self.watch_folder_enabled = False
+        self.reload_worker = None
+        self._reload_pending = False
+        self.file_watcher = SaveFileWatcher(self)
+        self.file_watcher.file_changed.connect(self.reload_from_disk)
+        self.file_watcher.folder_changed.connect(self.on_save_folder_changed)
+        self.size_profile_enabled = False
+        self.size_profile = None
+        self.profile_worker = None
+        self._profile_pending = False
+        self.autosave_timer = QTimer(self)
+        self.autosave_timer.setSingleShot(True)
+        self.autosave_timer.setInterval(AUTOSAVE_DELAY_MS)
+        self.autosave_timer.timeout.connect(self.autosave)
         self._loading = False
         self.beautify_names = False
         self.undo_stack = []
@@ -110,8 +164,10 @@ class SaveFileEditor(QMainWindow):
         file_layout.addWidget(self.save_btn)
 
         self.tree = QTreeWidget()
-        self.tree.setHeaderLabels(["Property", "Value"])
+        self.tree.setHeaderLabels(["Property", "Value", "Size", "Compressed", "Nodes"])
         self.tree.setColumnWidth(0, 250)
+        for column in (SIZE_COLUMN, COMPRESSED_COLUMN, NODES_COLUMN):
+            self.tree.setColumnHidden(column, True)
         self.tree.itemChanged.connect(self.handle_item_change)
 
         layout.addLayout(file_layout)
@@ -143,6 +199,42 @@ class SaveFileEditor(QMainWindow):
         detect_action.triggered.connect(self.show_game_detection)
         toolbar.addAction(detect_action)
 
+        history_path = Path(__file__).parent / "resources" / "icons" / "actions" / "refresh.svg"
+        history_icon = self.create_svg_icon(str(history_path), icon_color)
+        self.history_action = QAction(history_icon, "Save History", self)
+        self.history_action.triggered.connect(self.show_history)
+        self.history_action.setEnabled(False)
+        toolbar.addAction(self.history_action)
+
+        autosave_path = Path(__file__).parent / "resources" / "icons" / "actions" / "save-file.svg"
+        autosave_icon = self.create_svg_icon(str(autosave_path), icon_color)
+        self.autosave_action = QAction(autosave_icon, "Autosave", self)
+        self.autosave_action.setCheckable(True)
+        self.autosave_action.toggled.connect(self.toggle_autosave)
+        toolbar.addAction(self.autosave_action)
+
+        live_reload_path = Path(__file__).parent / "resources" / "icons" / "actions" / "search_for_game.svg"
+        live_reload_icon = self.create_svg_icon(str(live_reload_path), icon_color)
+        self.live_reload_action = QAction(live_reload_icon, "Live Reload", self)
+        self.live_reload_action.setCheckable(True)
+        self.live_reload_action.setChecked(self.live_reload_enabled)
+        self.live_reload_action.toggled.connect(self.toggle_live_reload)
+        toolbar.addAction(self.live_reload_action)
+
+        watch_folder_path = Path(__file__).parent / "resources" / "icons" / "actions" / "open-file.svg"
+        watch_folder_icon = self.create_svg_icon(str(watch_folder_path), icon_color)
+        self.watch_folder_action = QAction(watch_folder_icon, "Watch Save Folder", self)
+        self.watch_folder_action.setCheckable(True)
+        self.watch_folder_action.toggled.connect(self.toggle_watch_folder)
+        toolbar.addAction(self.watch_folder_action)
+
+        profile_path = Path(__file__).parent / "resources" / "icons" / "actions" / "rocket.svg"
+        profile_icon = self.create_svg_icon(str(profile_path), icon_color)
+        self.profile_action = QAction(profile_icon, "Size Profile", self)
+        self.profile_action.setCheckable(True)
+        self.profile_action.toggled.connect(self.toggle_size_profile)
+        toolbar.addAction(self.profile_action)
+
         undo_path = Path(__file__).parent / "resources" / "icons" / "actions" / "undo.svg"
         undo_icon = self.create_svg_icon(str(undo_path), icon_color)
         self.undo_action = QAction(undo_icon, "Undo", self)
@@ -194,6 +286,21 @@ class SaveFileEditor(QMainWindow):
         if detect_action:
             detect_action.setIcon(self.create_svg_icon(str(detect_path), color))
 
+        history_path = Path(__file__).parent / "resources" / "icons" / "actions" / "refresh.svg"
+        self.history_action.setIcon(self.create_svg_icon(str(history_path), color))
+
+        autosave_path = Path(__file__).parent / "resources" / "icons" / "actions" / "save-file.svg"
+        self.autosave_action.setIcon(self.create_svg_icon(str(autosave_path), color))
+
+        live_reload_path = Path(__file__).parent / "resources" / "icons" / "actions" / "search_for_game.svg"
+        self.live_reload_action.setIcon(self.create_svg_icon(str(live_reload_path), color))
+
+        watch_folder_path = Path(__file__).parent / "resources" / "icons" / "actions" / "open-file.svg"
+        self.watch_folder_action.setIcon(self.create_svg_icon(str(watch_folder_path), color))
+
+        profile_path = Path(__file__).parent / "resources" / "icons" / "actions" / "rocket.svg"
+        self.profile_action.setIcon(self.create_svg_icon(str(profile_path), color))
+
         undo_path = Path(__file__).parent / "resources" / "icons" / "actions" / "undo.svg"
         self.undo_action.setIcon(self.create_svg_icon(str(undo_path), color))
 
@@ -235,6 +342,8 @@ class SaveFileEditor(QMainWindow):
             )
 
             save_dir = game_path / "www/save"
+            if not save_dir.exists() and (game_path / "save").exists():
+                save_dir = game_path / "save"
 
             if not save_dir.exists():
                 save_dir.mkdir(parents=True)
@@ -243,17 +352,18 @@ class SaveFileEditor(QMainWindow):
                 self,
                 "Open Save File",
                 str(save_dir),
-                "RPG Maker Save Files (*.rpgsave)"
+                file_dialog_filter()
             )
 
             if filename:
                 self.current_file = filename
+                self.game_db = GameDatabase.from_game_root(game_path)
                 self.load_file()
 
         except Exception as e:
             self.show_error("Selection Error", str(e))
 
-    def save_expansion_states(self):
+    def save_expansion_states(self, root=None):
         expanded = set()
 
         def walk(item, path):
@@ -264,10 +374,10 @@ class SaveFileEditor(QMainWindow):
                     expanded.add('/'.join(child_path))
                 walk(child, child_path)
 
-        walk(self.tree.invisibleRootItem(), [])
+        walk(root or self.tree.invisibleRootItem(), [])
         return expanded
 
-    def restore_expansion_states(self, expanded):
+    def restore_expansion_states(self, expanded, root=None):
         def walk(item, path):
             for i in range(item.childCount()):
                 child = item.child(i)
@@ -276,7 +386,7 @@ class SaveFileEditor(QMainWindow):
                     child.setExpanded(True)
                 walk(child, child_path)
 
-        walk(self.tree.invisibleRootItem(), [])
+        walk(root or self.tree.invisibleRootItem(), [])
 
     def beautify_key(self, key):
         clean_key = key.lstrip('_0123456789')
@@ -292,10 +402,11 @@ class SaveFileEditor(QMainWindow):
 
     def open_file(self):
         file_path, _ = QFileDialog.getOpenFileName(
-            self, "Open Save File", "", "RPG Maker Save Files (*.rpgsave)"
+            self, "Open Save File", "", file_dialog_filter()
         )
         if file_path:
             self.current_file = file_path
+            self.game_db = None
             self.undo_stack.clear()
             self.redo_stack.clear()
             self.update_undo_redo_buttons()
@@ -331,18 +442,28 @@ class SaveFileEditor(QMainWindow):
 
         self._loading = True
         try:
+            self.close_history()
             self.open_btn.setEnabled(False)
             self.save_btn.setEnabled(False)
             QApplication.processEvents()
 
-            with open(self.current_file, "r", encoding="utf-8") as f:
-                compressed_data = f.read()
-
-            decompressed = self.lz.decompressFromBase64(compressed_data)
-            if not decompressed:
-                raise ValueError("Invalid decompression result")
+            with open(self.current_file, "rb") as f:
+                raw_data = f.read()
 
+            codec, decompressed = decode_save(raw_data, self.current_file)
             self.data = json.loads(decompressed)
+            self.codec = codec
+            # Never reset the counter: workers started before this load compare against it.
+            self.generation += 1
+            self.saved_generation = self.load_generation = self.generation
+            self.base_json = serialize_data(self.data)
+            self.saved_hash = content_hash(self.base_json)
+            self.pending_save_hash = None
+            self.size_profile = None
+            self.update_dirty_state()
+            self.game_db = GameDatabase.from_save_file(self.current_file) or self.game_db
+            if self.game_db:
+                self.game_db.refresh()
             self.tree.blockSignals(True)
             try:
                 self.populate_tree()
@@ -350,6 +471,10 @@ class SaveFileEditor(QMainWindow):
                 self.tree.blockSignals(False)
 
             self.save_btn.setEnabled(True)
+            self.history_action.setEnabled(True)
+            self.record_snapshot("Opened", self.base_json)
+            self.update_watches()
+            self.start_size_profile()
 
         except Exception as e:
             error_details = f"File: {self.current_file}\nError: {str(e)}"
@@ -359,7 +484,9 @@ class SaveFileEditor(QMainWindow):
             self.open_btn.setEnabled(True)
 
     def populate_tree(self, data=None, parent=None):
+        sorting = self.tree.isSortingEnabled()
         try:
+            self.tree.setSortingEnabled(False)
             self.tree.clear()
             data = data or self.data
             root = self.tree.invisibleRootItem()
@@ -368,42 +495,75 @@ class SaveFileEditor(QMainWindow):
                 self._populate_dict(data, root)
             elif isinstance(data, list):
                 self._populate_list(data, root)
+            self.apply_size_profile()
 
         except RuntimeError as e:
             if "wrapped C/C++ object" in str(e):
                 print("Handled deleted object reference")
             else:
                 raise
+        finally:
+            self.tree.setSortingEnabled(sorting)
 
-    def _populate_dict(self, data, parent):
-        for key, value in data.items():
+    def _populate_dict(self, data, parent, key_table=None, value_table=None):
+        for index, (key, value) in enumerate(data.items()):
             item = SafeTreeWidgetItem(parent)
             item.original_key = key
+            item.container = data
+            item.data_key = key
+            item.sort_index = index
             display_key = self.beautify_key(key) if self.beautify_names else key
             item.setText(0, display_key)
-            self._process_value(value, item)
+            self.annotate_game_name(item, key_table, key)
+            self._process_value(value, item, key_table, value_table)
 
-    def _populate_list(self, data, parent):
+    def _populate_list(self, data, parent, key_table=None, value_table=None):
         for index, value in enumerate(data):
             item = SafeTreeWidgetItem(parent)
             item.original_key = str(index)
+            item.container = data
+            item.data_key = index
+            item.sort_index = index
             display_index = str(index)
             item.setText(0, display_index)
-            self._process_value(value, item)
+            self.annotate_game_name(item, key_table, index)
+            self._process_value(value, item, key_table, value_table)
 
-    def _process_value(self, value, item):
+    def _process_value(self, value, item, key_table=None, value_table=None):
         item.takeChildren()
+        key = item.original_key
         if isinstance(value, (dict, list)):
             item.setText(1, f"[{type(value).__name__.capitalize()}]")
             item.setFlags(item.flags() & ~Qt.ItemIsEditable)
+            # "@a" is JsonEx's array wrapper, so it keeps the tables of its owner.
+            if key != "@a":
+                key_table = value_table = None
+                if self.game_db:
+                    parent = item.parent()
+                    parent_key = parent.original_key if isinstance(parent, SafeTreeWidgetItem) else ""
+                    key_table = self.game_db.key_table(parent_key, key)
+                    value_table = self.game_db.value_table(key)
             if isinstance(value, dict):
-                self._populate_dict(value, item)
+                self._populate_dict(value, item, key_table, value_table)
             else:
-                self._populate_list(value, item)
+                self._populate_list(value, item, key_table, value_table)
         else:
             item.setText(1, str(value))
             item.setFlags(item.flags() | Qt.ItemIsEditable)
             item.takeChildren()
+            if self.game_db:
+                # Only list entries inherit their owner's table; JsonEx's "@c" counter does not.
+                if not isinstance(item.container, list):
+                    value_table = None
+                self.annotate_game_name(item, self.game_db.value_table(key) or value_table, value)
+
+    def annotate_game_name(self, item, table, entry_id):
+        if not self.game_db or not table:
+            return
+        name = self.game_db.lookup(table, entry_id)
+        if name:
+            item.setText(0, f"{item.text(0)} ({name})")
+            item.setToolTip(0, name)
 
     def handle_item_change(self, item, column):
         if not self._loading and column == 1:
@@ -416,73 +576,77 @@ class SaveFileEditor(QMainWindow):
                 else:
                     raise
 
-    def update_data_structure(self, item):
-        current_item = item
+    def item_path(self, item):
         path = []
-        original_text = item.text(1)
+        while isinstance(item, SafeTreeWidgetItem):
+            path.append(item.data_key)
+            item = item.parent()
+        path.reverse()
+        return path
+
+    def update_data_structure(self, item):
+        container = item.container
+        key = item.data_key
 
         try:
-            while current_item and current_item != self.tree.invisibleRootItem():
-                if isinstance(current_item, SafeTreeWidgetItem):
-                    path.insert(0, current_item.original_key)
-                else:
-                    path.insert(0, current_item.text(0))
-                current_item = current_item.parent()
-
-            current_data = self.data
-            for i, step in enumerate(path):
-                if isinstance(current_data, dict):
-                    if step not in current_data:
-                        available = list(current_data.keys())
-                        raise KeyError(
-                            f"Key '{step}' not found at position {i}.\n"
-                            f"Available keys: {available}"
-                        )
-                    current_data = current_data[step]
-                elif isinstance(current_data, list):
-                    try:
-                        idx = int(step)
-                    except ValueError:
-                        raise TypeError(f"Invalid list index '{step}' at position {i}")
-                    if idx >= len(current_data) or idx < 0:
-                        raise IndexError(
-                            f"Index {idx} out of range (0-{len(current_data) - 1}) at position {i}"
-                        )
-                    current_data = current_data[idx]
-                else:
-                    raise TypeError(
-                        f"Unexpected {type(current_data).__name__} at position {i}"
-                    )
+            parent = item.parent()
+            if isinstance(parent, SafeTreeWidgetItem):
+                owner = parent.container[parent.data_key]
+            else:
+                owner = self.data
+            if container is not owner:
+                raise RuntimeError("The tree is out of date with the save data; reopen the file")
+            if isinstance(container, dict):
+                if key not in container:
+                    raise KeyError(f"Key '{key}' not found")
+            elif isinstance(container, list):
+                if not 0 <= key < len(container):
+                    raise IndexError(f"Index {key} out of range (0-{len(container) - 1})")
+            else:
+                raise TypeError(f"Unexpected {type(container).__name__} as container")
 
-            old_value = current_data
+            old_value = container[key]
             new_value = self.convert_value(item.text(1))
 
             if old_value != new_value:
-                self.undo_stack.append(Command(path.copy(), old_value, new_value))
+                path = self.item_path(item)
+                self.undo_stack.append(Command(path, old_value, new_value))
                 self.redo_stack.clear()
                 self.update_undo_redo_buttons()
 
-                target = self.data
-                for step in path[:-1]:
-                    target = target[step]
-                target[path[-1]] = new_value
+                container[key] = new_value
 
-                self.reload_tree()
+                self.mark_dirty()
+                self.refresh_edited_item(item, path, old_value, new_value)
+                self.update_size_profile(path, new_value, item)
 
         except Exception as e:
             self.tree.blockSignals(True)
-            item.setText(1, str(original_text))
+            try:
+                item.setText(1, str(container[key]))
+            except (KeyError, IndexError, TypeError):
+                pass
             self.tree.blockSignals(False)
 
             error_details = (
-                f"Path: {' → '.join(path)}\n"
+                f"Path: {format_path(self.item_path(item))}\n"
                 f"Error: {str(e)}\n"
-                f"Data Type at Failure: {type(current_data).__name__}\n"
-                f"Full Data: {json.dumps(self.data, indent=2)}"
+                f"Data Type at Failure: {type(container).__name__}\n"
+                f"Data Excerpt:\n{excerpt(container)}"
             )
             self.show_error("Update Failed", "Could not update value", error_details)
             print(f"Critical Update Error:\n{error_details}")
 
+    def refresh_edited_item(self, item, path, old_value, new_value):
+        if self.can_patch_value(path, old_value, new_value):
+            self.tree.blockSignals(True)
+            try:
+                item.setText(1, str(new_value))
+            finally:
+                self.tree.blockSignals(False)
+        else:
+            self.refresh_changed_items([(tuple(path), old_value, new_value)])
+
     def reload_tree(self):
         if self.data:
             expanded = self.save_expansion_states()
@@ -508,20 +672,450 @@ class SaveFileEditor(QMainWindow):
                 return value
 
     def save_file(self):
-        if not self.current_file:
+        if not self.current_file or not self.codec:
             return
 
-        backup_path = self.current_file + ".bak"
+        self.autosave_timer.stop()
+        if self.save_worker and self.save_worker.isRunning():
+            self.save_worker.wait()
+
         try:
-            shutil.copyfile(self.current_file, backup_path)
-            json_data = json.dumps(self.data, separators=(',', ':'), ensure_ascii=False)
-            compressed_data = self.lz.compressToBase64(json_data)
-            with open(self.current_file, "w", encoding="utf-8") as f:
-                f.write(compressed_data)
+            json_data = serialize_data(self.data)
+            data_hash = content_hash(json_data)
+            if data_hash == self.saved_hash:
+                self.mark_saved(self.generation, data_hash, json_data)
+                QMessageBox.information(self, "No Changes", "The save file is already up to date.")
+                return
+            self.pending_save_hash = data_hash
+            write_save_file(self.current_file, self.codec, json_data)
+            self.mark_saved(self.generation, data_hash, json_data)
+            self.record_snapshot("Saved", json_data)
             QMessageBox.information(self, "Success", "Save file updated successfully!")
         except Exception as e:
+            self.pending_save_hash = None
             QMessageBox.critical(self, "Error", f"Failed to save file:\n{str(e)}")
 
+    def is_dirty(self):
+        return self.generation != self.saved_generation
+
+    def mark_dirty(self):
+        self.generation += 1
+        self.update_dirty_state()
+        if self.autosave_enabled and self.current_file:
+            self.autosave_timer.start()
+
+    def mark_saved(self, generation, data_hash, json_data):
+        self.saved_generation = generation
+        self.saved_hash = data_hash
+        self.base_json = json_data
+        self.pending_save_hash = None
+        self.update_dirty_state()
+
+    def update_dirty_state(self):
+        title = "RPG Maker MV Save Editor"
+        if self.current_file:
+            title += f" - {Path(self.current_file).name}"
+            if self.is_dirty():
+                title += " *"
+        self.setWindowTitle(title)
+
+    def check_saved_content(self):
+        # Undone edits leave the generation ahead of the save, so compare the
+        # content itself before treating the document as dirty.
+        if self.is_dirty() and self.saved_hash and content_hash(serialize_data(self.data)) == self.saved_hash:
+            self.saved_generation = self.generation
+            self.autosave_timer.stop()
+            self.update_dirty_state()
+        return self.is_dirty()
+
+    def toggle_autosave(self, state):
+        self.autosave_enabled = state
+        if state and self.is_dirty():
+            self.autosave_timer.start()
+        elif not state:
+            self.autosave_timer.stop()
+
+    def autosave(self):
+        if not self.autosave_enabled or not self.current_file or not self.codec or not self.is_dirty():
+            return
+        if self.save_worker and self.save_worker.isRunning():
+            self.autosave_timer.start()
+            return
+
+        json_data = serialize_data(self.data)
+        data_hash = content_hash(json_data)
+        if data_hash == self.saved_hash:
+            self.mark_saved(self.generation, data_hash, json_data)
+            return
+
+        try:
+            store = self.get_snapshot_store()
+        except Exception as e:
+            print(f"Snapshot error: {str(e)}")
+            store = None
+        self.save_worker = SaveWorker(
+            self.current_file, self.codec, json_data, self.generation, data_hash, store
+        )
+        self.save_worker.saved.connect(self.on_autosave_finished)
+        self.save_worker.error_occurred.connect(self.on_autosave_error)
+        self.pending_save_hash = data_hash
+        self.save_worker.start()
+
+    def on_autosave_finished(self, path, generation, data_hash, json_data):
+        if path != self.current_file or generation < max(self.saved_generation, self.load_generation):
+            return
+        self.mark_saved(generation, data_hash, json_data)
+        self.statusBar().showMessage("Autosaved", 3000)
+
+    def on_autosave_error(self, message):
+        self.pending_save_hash = None
+        self.statusBar().showMessage(message, 10000)
+        print(message)
+
+    def toggle_live_reload(self, state):
+        self.live_reload_enabled = state
+        self.update_watches()
+
+    def toggle_watch_folder(self, state):
+        self.watch_folder_enabled = state
+        self.update_watches()
+
+    def update_watches(self):
+        if self.live_reload_enabled and self.current_file and self.codec:
+            self.file_watcher.watch_file(self.current_file)
+        else:
+            self.file_watcher.unwatch_file()
+
+        if self.watch_folder_enabled and self.current_file:
+            self.file_watcher.watch_folder(Path(self.current_file).parent)
+        else:
+            self.file_watcher.unwatch_folder()
+
+    def on_save_folder_changed(self, paths):
+        names = ', '.join(Path(p).name for p in paths)
+        self.statusBar().showMessage(f"Changed on disk: {names}", 10000)
+
+    def reload_from_disk(self, *args):
+        if not self.live_reload_enabled or not self.current_file or not self.codec or self._loading:
+            return
+        if self.reload_worker and self.reload_worker.isRunning():
+            self._reload_pending = True
+            return
+
+        self._reload_pending = False
+        known_hashes = {h for h in (self.saved_hash, self.pending_save_hash) if h}
+        local_json = serialize_data(self.data) if self.is_dirty() else None
+        self.reload_worker = ReloadWorker(
+            self.current_file, self.generation, self.base_json, known_hashes, local_json
+        )
+        self.reload_worker.reloaded.connect(self.merge_external_changes)
+        self.reload_worker.error_occurred.connect(self.on_reload_error)
+        self.reload_worker.finished.connect(self.on_reload_finished)
+        self.reload_worker.start()
+
+    def on_reload_finished(self, *args):
+        if self._reload_pending:
+            self.reload_from_disk()
+
+    def on_reload_error(self, message):
+        self.statusBar().showMessage(message, 10000)
+        print(message)
+
+    def merge_external_changes(self, result):
+        if result.path != self.current_file:
+            return
+        if result.generation != self.generation:
+            # The document was edited while the reload ran, so redo it against the new edits.
+            self._reload_pending = True
+            return
+
+        changed_paths = [path for path, _, _ in result.changes]
+        conflict_paths = set(overlapping_paths(changed_paths, result.local_paths))
+        applied, conflicts, removals = [], [], []
+
+        for change in result.changes:
+            path, old, new = change
+            if path in conflict_paths:
+                conflicts.append(change)
+            elif not path:
+                self.data = new
+                applied.append(change)
+            elif new is MISSING:
+                removals.append(change)
+            else:
+                try:
+                    apply_change(self.data, path, new)
+                    applied.append(change)
+                except (KeyError, IndexError, TypeError):
+                    conflicts.append(change)
+
+        # Removed list entries always come from the tail, so drop them last-first.
+        for change in reversed(removals):
+            try:
+                apply_change(self.data, change[0], MISSING)
+                applied.append(change)
+            except (KeyError, IndexError, TypeError):
+                conflicts.append(change)
+
+        self.base_json = result.json_data
+        self.saved_hash = result.data_hash
+        if not result.local_paths and not conflicts:
+            self.saved_generation = self.generation
+        self.update_dirty_state()
+
+        self.refresh_changed_items(applied)
+        if applied:
+            self.start_size_profile()
+        self.flag_conflicts(conflicts)
+        self.statusBar().showMessage(
+            f"Reloaded {len(applied)} changes from disk"
+            + (f", {len(conflicts)} conflicts with unsaved edits" if conflicts else ""),
+            10000
+        )
+
+    def find_tree_item(self, path):
+        item = self.tree.invisibleRootItem()
+        for depth, step in enumerate(path):
+            key = str(step)
+            for i in range(item.childCount()):
+                if item.child(i).original_key == key:
+                    item = item.child(i)
+                    break
+            else:
+                return item, depth
+        return item, len(path)
+
+    def value_at(self, path):
+        value = self.data
+        for step in path:
+            value = value[step]
+        return value
+
+    def refresh_changed_items(self, changes):
+        targets = {}
+        self.tree.blockSignals(True)
+        try:
+            for path, old, new in changes:
+                if not path:
+                    self.reload_tree()
+                    return
+                item, depth = self.find_tree_item(path)
+                if depth == len(path) and self.can_patch_value(path, old, new):
+                    item.setText(1, str(new))
+                    continue
+
+                container_path = path[:-1]
+                item, depth = self.find_tree_item(container_path)
+                container_path = container_path[:depth]
+                # Re-render the owner of a JsonEx "@a" wrapper so ID names stay resolved.
+                while container_path and container_path[-1] == "@a":
+                    container_path = container_path[:-1]
+                    item = item.parent() or self.tree.invisibleRootItem()
+                targets[container_path] = item
+
+            refreshed = []
+            for container_path in sorted(targets, key=len):
+                if any(container_path[:len(done)] == done for done in refreshed):
+                    continue
+                refreshed.append(container_path)
+                if not container_path:
+                    self.reload_tree()
+                    return
+                item = targets[container_path]
+                expanded = self.save_expansion_states(item)
+                self._process_value(self.value_at(container_path), item)
+                self.restore_expansion_states(expanded, item)
+                self.apply_size_profile(item, container_path)
+        finally:
+            self.tree.blockSignals(False)
+
+    def can_patch_value(self, path, old, new):
+        if isinstance(old, (dict, list)) or isinstance(new, (dict, list)) or MISSING in (old, new):
+            return False
+        if not self.game_db:
+            return True
+        owners = [step for step in path[:-1] if step != "@a"][-1:]
+        return not any(self.game_db.value_table(key) for key in [path[-1]] + owners if isinstance(key, str))
+
+    def flag_conflicts(self, conflicts):
+        if not conflicts:
+            return
+        highlight = QBrush(QColor("#e5a50a"))
+        lines = []
+        for path, old, new in conflicts:
+            item, _ = self.find_tree_item(path)
+            if item is not self.tree.invisibleRootItem():
+                item.setForeground(0, highlight)
+                item.setForeground(1, highlight)
+                item.setToolTip(1, f"Changed on disk to: {format_value(new)}")
+            if len(lines) < MAX_CONFLICT_LINES:
+                lines.append(format_change(path, old, new))
+        if len(conflicts) > MAX_CONFLICT_LINES:
+            lines.append(f"... {len(conflicts) - MAX_CONFLICT_LINES} more")
+
+        QMessageBox.warning(
+            self,
+            "Conflicting Changes",
+            "The save file changed on disk in places you have unsaved edits. "
+            "Your edits were kept; saving will overwrite these disk changes:\n\n"
+            + '\n'.join(lines)
+        )
+
+    def toggle_size_profile(self, state):
+        self.size_profile_enabled = state
+        for column in (SIZE_COLUMN, COMPRESSED_COLUMN, NODES_COLUMN):
+            self.tree.setColumnHidden(column, not state)
+        if state:
+            self.tree.setSortingEnabled(True)
+            self.tree.sortByColumn(SIZE_COLUMN, Qt.DescendingOrder)
+            if self.size_profile:
+                self.apply_size_profile()
+            else:
+                self.start_size_profile()
+        else:
+            self.tree.sortByColumn(0, Qt.AscendingOrder)
+            self.tree.setSortingEnabled(False)
+
+    def start_size_profile(self):
+        if not self.size_profile_enabled or not self.data:
+            return
+        if self.profile_worker and self.profile_worker.isRunning():
+            self._profile_pending = True
+            return
+
+        self._profile_pending = False
+        self.profile_worker = ProfileWorker(serialize_data(self.data), self.generation)
+        self.profile_worker.finished_profile.connect(self.on_size_profile_finished)
+        self.profile_worker.error_occurred.connect(self.on_size_profile_error)
+        self.profile_worker.finished.connect(self.on_size_profile_thread_finished)
+        self.profile_worker.start()
+        self.statusBar().showMessage("Profiling save size...")
+
+    def on_size_profile_thread_finished(self):
+        if self._profile_pending:
+            self.start_size_profile()
+
+    def on_size_profile_finished(self, generation, profile):
+        if generation != self.generation:
+            self._profile_pending = True
+            return
+        self.size_profile = profile
+        self.apply_size_profile()
+        total = profile.total()
+        self.statusBar().showMessage(
+            f"Save size: {format_size(total[0])} JSON, about {format_size(total[1])} compressed, "
+            f"{total[2]} nodes", 10000
+        )
+
+    def on_size_profile_error(self, message):
+        self.statusBar().showMessage(message, 10000)
+        print(message)
+
+    def update_size_profile(self, path, value, item=None):
+        if not self.size_profile_enabled:
+            return
+        affected = self.size_profile.update_value(path, value) if path and self.size_profile else None
+        if affected is None:
+            self.size_profile = None
+            self.start_size_profile()
+            return
+
+        sorting = self.tree.isSortingEnabled()
+        self.tree.setSortingEnabled(False)
+        self.tree.blockSignals(True)
+        try:
+            # affected runs from the edited value up to the root, one level per step.
+            if item is None:
+                item, depth = self.find_tree_item(path)
+                if depth != len(path):
+                    item = None
+            for affected_path in affected:
+                if not isinstance(item, SafeTreeWidgetItem):
+                    break
+                self.set_size_columns(item, self.size_profile.get(affected_path))
+                item = item.parent()
+        finally:
+            self.tree.blockSignals(False)
+            self.tree.setSortingEnabled(sorting)
+
+    def apply_size_profile(self, root=None, root_path=()):
+        if not self.size_profile_enabled or not self.size_profile:
+            return
+        sorting = self.tree.isSortingEnabled()
+        self.tree.setSortingEnabled(False)
+        self.tree.blockSignals(True)
+        stack = [(root or self.tree.invisibleRootItem(), tuple(str(step) for step in root_path))]
+        try:
+            while stack:
+                parent, parent_path = stack.pop()
+                for i in range(parent.childCount()):
+                    item = parent.child(i)
+                    path = parent_path + (item.original_key,)
+                    self.set_size_columns(item, self.size_profile.get(path))
+                    if item.childCount():
+                        stack.append((item, path))
+        finally:
+            self.tree.blockSignals(False)
+            self.tree.setSortingEnabled(sorting)
+
+    def set_size_columns(self, item, stats):
+        if not stats:
+            return
+        size, compressed, nodes = stats
+        total = self.size_profile.total()[0] or 1
+        item.setText(SIZE_COLUMN, format_size(size))
+        item.setData(SIZE_COLUMN, Qt.UserRole, size)
+        item.setToolTip(SIZE_COLUMN, f"{size} bytes ({size * 100 / total:.1f}% of the save)")
+        item.setText(COMPRESSED_COLUMN, format_size(compressed))
+        item.setData(COMPRESSED_COLUMN, Qt.UserRole, compressed)
+        item.setText(NODES_COLUMN, str(nodes))
+        item.setData(NODES_COLUMN, Qt.UserRole, nodes)
+
+    def get_snapshot_store(self):
+        if self.snapshot_store is None:
+            self.snapshot_store = SnapshotStore()
+        return self.snapshot_store
+
+    def record_snapshot(self, label, json_data):
+        try:
+            store = self.get_snapshot_store()
+        except Exception as e:
+            print(f"Snapshot error: {str(e)}")
+            return
+        worker = SnapshotWorker(store, self.current_file, json_data, self.codec.name if self.codec else "", label)
+        worker.finished.connect(lambda: self.snapshot_workers.remove(worker))
+        self.snapshot_workers.append(worker)
+        worker.start()
+
+    def show_history(self):
+        if not self.current_file:
+            return
+        try:
+            store = self.get_snapshot_store()
+        except Exception as e:
+            self.show_error("History Error", "Could not open the snapshot store", str(e))
+            return
+        self.close_history()
+        self.history_dialog = SnapshotHistoryDialog(self, store, self.current_file)
+        self.history_dialog.show()
+
+    def close_history(self):
+        if self.history_dialog:
+            self.history_dialog.close()
+            self.history_dialog = None
+
+    def restore_snapshot(self, data, save_path):
+        if save_path != self.current_file:
+            return False
+        self.undo_stack.append(Command([], self.data, data))
+        self.redo_stack.clear()
+        self.update_undo_redo_buttons()
+        self.data = data
+        self.mark_dirty()
+        self.start_size_profile()
+        self.reload_tree()
+        return True
+
     def update_undo_redo_buttons(self):
         self.undo_action.setEnabled(len(self.undo_stack) > 0)
         self.redo_action.setEnabled(len(self.redo_stack) > 0)
@@ -533,6 +1127,8 @@ class SaveFileEditor(QMainWindow):
         self.apply_command(cmd, undo=True)
         self.redo_stack.append(cmd)
         self.update_undo_redo_buttons()
+        if not self.undo_stack:
+            self.check_saved_content()
 
     def redo(self):
         if not self.redo_stack:
@@ -541,6 +1137,8 @@ class SaveFileEditor(QMainWindow):
         self.apply_command(cmd, undo=False)
         self.undo_stack.append(cmd)
         self.update_undo_redo_buttons()
+        if not self.redo_stack:
+            self.check_saved_content()
 
     def apply_command(self, cmd, undo):
         value = cmd.old_value if undo else cmd.new_value
@@ -557,7 +1155,13 @@ class SaveFileEditor(QMainWindow):
             else:
                 self.data = value
 
-            self.reload_tree()
+            self.mark_dirty()
+            self.update_size_profile(path, value)
+            if path:
+                previous = cmd.new_value if undo else cmd.old_value
+                self.refresh_changed_items([(tuple(path), previous, value)])
+            else:
+                self.reload_tree()
 
         except Exception as e:
             self.show_error("Undo/Redo Error", str(e))
@@ -565,7 +1169,19 @@ class SaveFileEditor(QMainWindow):
             self.tree.blockSignals(False)
 
     def closeEvent(self, event):
-        if self.undo_stack:
+        self.autosave_timer.stop()
+        self.file_watcher.unwatch_file()
+        self.file_watcher.unwatch_folder()
+        if self.reload_worker and self.reload_worker.isRunning():
+            self.reload_worker.wait()
+        if self.profile_worker and self.profile_worker.isRunning():
+            self.profile_worker.wait()
+        if self.save_worker and self.save_worker.isRunning():
+            self.save_worker.wait()
+            QApplication.processEvents()
+        for worker in list(self.snapshot_workers):
+            worker.wait()
+        if self.check_saved_content():
             reply = QMessageBox.question(
                 self,
                 "Unsaved Changes",
@@ -573,6 +1189,10 @@ class SaveFileEditor(QMainWindow):
                 QMessageBox.Yes | QMessageBox.No
             )
             if reply == QMessageBox.No:
+                # The window stays open, so bring back what was paused above.
                 event.ignore()
+                self.update_watches()
+                if self.autosave_enabled:
+                    self.autosave_timer.start()
                 return
         event.accept()
\ No newline at end of file
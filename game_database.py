@@ -0,0 +1,155 @@
+import os
+import json
+import hashlib
+from pathlib import Path
+from app_paths import cache_dir
+
+INDEX_VERSION = 1
+
+TABLE_SOURCES = {
+    "actors": ("Actors.json", None),
+    "items": ("Items.json", None),
+    "weapons": ("Weapons.json", None),
+    "armors": ("Armors.json", None),
+    "maps": ("MapInfos.json", None),
+    "switches": ("System.json", "switches"),
+    "variables": ("System.json", "variables"),
+}
+
+# Containers whose keys (or list indices) are database IDs.
+KEY_TABLES = {
+    ("actors", "_data"): "actors",
+    ("party", "_items"): "items",
+    ("party", "_weapons"): "weapons",
+    ("party", "_armors"): "armors",
+    ("switches", "_data"): "switches",
+    ("variables", "_data"): "variables",
+}
+
+# Keys whose values are database IDs; for lists this applies to every element.
+VALUE_TABLES = {
+    "_actorId": "actors",
+    "_actors": "actors",
+    "_mapId": "maps",
+    "_newMapId": "maps",
+}
+
+
+def extract_names(source, field=None):
+    entries = source.get(field, []) if field else source
+    names = {}
+    for index, entry in enumerate(entries):
+        if isinstance(entry, dict):
+            entry_id, name = entry.get("id", index), entry.get("name")
+        else:
+            entry_id, name = index, entry
+        if isinstance(name, str) and name:
+            names[str(entry_id)] = name
+    return names
+
+
+class GameDatabase:
+    def __init__(self, data_dir):
+        self.data_dir = Path(data_dir)
+        digest = hashlib.sha1(str(self.data_dir.resolve()).lower().encode("utf-8")).hexdigest()[:16]
+        # The index location is only resolved when first needed, so a cache
+        # folder that cannot be created just leaves the tables in memory.
+        self.index_name = f"{digest}.json"
+        self.index_path = None
+        self._index_unavailable = False
+        self._index = None
+        self._tables = {}
+
+    @classmethod
+    def from_game_root(cls, game_root):
+        game_root = Path(game_root)
+        for data_dir in (game_root / "www" / "data", game_root / "data"):
+            if (data_dir / "System.json").exists():
+                return cls(data_dir)
+        return None
+
+    @classmethod
+    def from_save_file(cls, save_path):
+        data_dir = Path(save_path).resolve().parent.parent / "data"
+        if (data_dir / "System.json").exists():
+            return cls(data_dir)
+        return None
+
+    def refresh(self):
+        self._tables.clear()
+
+    def table(self, name):
+        if name not in self._tables:
+            self._tables[name] = self._load_table(name)
+        return self._tables[name]
+
+    def lookup(self, table_name, entry_id):
+        if table_name is None or entry_id is None or isinstance(entry_id, bool):
+            return None
+        return self.table(table_name).get(str(entry_id))
+
+    def key_table(self, parent_key, key):
+        return KEY_TABLES.get((parent_key, key))
+
+    def value_table(self, key):
+        return VALUE_TABLES.get(key)
+
+    def _get_index_path(self):
+        if self.index_path is None and not self._index_unavailable:
+            try:
+                self.index_path = cache_dir("index") / self.index_name
+            except OSError as e:
+                self._index_unavailable = True
+                print(f"Name index unavailable: {str(e)}")
+        return self.index_path
+
+    def _read_index(self):
+        if self._index is None:
+            try:
+                index_path = self._get_index_path()
+                if index_path is None:
+                    raise OSError("No index path")
+                with open(index_path, "r", encoding="utf-8") as f:
+                    index = json.load(f)
+                if index.get("version") != INDEX_VERSION:
+                    raise ValueError("Stale index version")
+                self._index = index
+            except (OSError, ValueError):
+                self._index = {"version": INDEX_VERSION, "tables": {}}
+        return self._index
+
+    def _write_index(self):
+        index_path = self._get_index_path()
+        if index_path is None:
+            return
+        tmp_path = index_path.with_suffix(".tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._index, f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(tmp_path, index_path)
+        except OSError as e:
+            print(f"Failed to write name index: {str(e)}")
+
+    def _load_table(self, name):
+        filename, field = TABLE_SOURCES[name]
+        source_path = self.data_dir / filename
+        try:
+            stat = source_path.stat()
+        except OSError:
+            return {}
+
+        index = self._read_index()
+        entry = index["tables"].get(name)
+        if entry and entry["mtime"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+            return entry["names"]
+
+        try:
+            with open(source_path, "r", encoding="utf-8-sig") as f:
+                names = extract_names(json.load(f), field)
+        except (OSError, ValueError) as e:
+            print(f"Failed to read {filename}: {str(e)}")
+            return {}
+
+        index["tables"][name] = {"mtime": stat.st_mtime_ns, "size": stat.st_size, "names": names}
+        self._write_index()
+        return names
@@ -0,0 +1,138 @@
+from datetime import datetime
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QListWidget, QListWidgetItem, QLabel,
+    QPushButton, QSplitter
+)
+from data_diff import diff_values, format_change
+
+MAX_DIFF_LINES = 500
+
+
+class SnapshotHistoryDialog(QDialog):
+    def __init__(self, parent, store, save_path):
+        super().__init__(parent)
+        self.parent_editor = parent
+        self.store = store
+        self.save_path = save_path
+        self.init_ui()
+        self.load_snapshots()
+
+    def init_ui(self):
+        self.setWindowTitle("Save History")
+        self.setMinimumSize(600, 400)
+        self.layout = QVBoxLayout()
+
+        self.snapshot_list = QListWidget()
+        self.snapshot_list.currentRowChanged.connect(self.update_buttons)
+        self.diff_list = QListWidget()
+        self.status_label = QLabel("")
+        self.status_label.setAlignment(Qt.AlignCenter)
+        self.status_label.setStyleSheet("background-color: transparent;")
+
+        splitter = QSplitter(Qt.Vertical)
+        splitter.addWidget(self.snapshot_list)
+        splitter.addWidget(self.diff_list)
+
+        button_layout = QHBoxLayout()
+        self.previous_btn = QPushButton("Compare with Previous")
+        self.previous_btn.clicked.connect(self.compare_with_previous)
+        self.current_btn = QPushButton("Compare with Current")
+        self.current_btn.clicked.connect(self.compare_with_current)
+        self.restore_btn = QPushButton("Restore")
+        self.restore_btn.clicked.connect(self.restore_selected)
+        button_layout.addWidget(self.previous_btn)
+        button_layout.addWidget(self.current_btn)
+        button_layout.addWidget(self.restore_btn)
+
+        self.layout.addWidget(self.status_label)
+        self.layout.addWidget(splitter)
+        self.layout.addLayout(button_layout)
+        self.setLayout(self.layout)
+
+    def load_snapshots(self):
+        self.snapshot_list.clear()
+        self.snapshots = self.store.list_snapshots(self.save_path)
+        for snapshot in reversed(self.snapshots):
+            created = datetime.fromtimestamp(snapshot.created).strftime("%Y-%m-%d %H:%M:%S")
+            text = f"#{snapshot.id}  {created}  {snapshot.size / 1024:.1f} KB"
+            if snapshot.label:
+                text += f"  {snapshot.label}"
+            item = QListWidgetItem(text)
+            item.setData(Qt.UserRole, snapshot.id)
+            self.snapshot_list.addItem(item)
+        self.status_label.setText(f"{len(self.snapshots)} snapshots")
+        self.update_buttons()
+
+    def selected_id(self):
+        item = self.snapshot_list.currentItem()
+        return item.data(Qt.UserRole) if item else None
+
+    def update_buttons(self, *args):
+        snapshot_id = self.selected_id()
+        self.current_btn.setEnabled(snapshot_id is not None)
+        self.restore_btn.setEnabled(snapshot_id is not None)
+        self.previous_btn.setEnabled(
+            snapshot_id is not None and bool(self.snapshots) and snapshot_id != self.snapshots[0].id
+        )
+
+    def is_current_file(self):
+        # The dialog is modeless, so another file may have been opened since.
+        if self.parent_editor.current_file == self.save_path:
+            return True
+        self.status_label.setText("Another save file is open; reopen the history for it")
+        return False
+
+    def show_changes(self, changes, title):
+        self.diff_list.clear()
+        count = 0
+        for path, old, new in changes:
+            count += 1
+            if count <= MAX_DIFF_LINES:
+                self.diff_list.addItem(format_change(path, old, new))
+        if count > MAX_DIFF_LINES:
+            self.diff_list.addItem(f"... {count - MAX_DIFF_LINES} more changes")
+        self.status_label.setText(f"{title}: {count} changes" if count else f"{title}: no changes")
+
+    def compare_with_previous(self):
+        snapshot_id = self.selected_id()
+        ids = [s.id for s in self.snapshots]
+        if snapshot_id not in ids or ids.index(snapshot_id) == 0:
+            return
+        previous_id = ids[ids.index(snapshot_id) - 1]
+        try:
+            self.show_changes(
+                self.store.diff(self.save_path, previous_id, snapshot_id),
+                f"#{previous_id} → #{snapshot_id}"
+            )
+        except Exception as e:
+            self.parent_editor.show_error(
+                "Compare Failed", f"Could not compare #{previous_id} with #{snapshot_id}", str(e)
+            )
+
+    def compare_with_current(self):
+        snapshot_id = self.selected_id()
+        if snapshot_id is None or not self.is_current_file():
+            return
+        try:
+            snapshot_data = self.store.restore(self.save_path, snapshot_id)
+            self.show_changes(
+                diff_values(snapshot_data, self.parent_editor.data),
+                f"#{snapshot_id} → current"
+            )
+        except Exception as e:
+            self.parent_editor.show_error(
+                "Compare Failed", f"Could not compare #{snapshot_id} with the current data", str(e)
+            )
+
+    def restore_selected(self):
+        snapshot_id = self.selected_id()
+        if snapshot_id is None or not self.is_current_file():
+            return
+        try:
+            data = self.store.restore(self.save_path, snapshot_id)
+        except Exception as e:
+            self.parent_editor.show_error("Restore Failed", f"Could not restore snapshot #{snapshot_id}", str(e))
+            return
+        if self.parent_editor.restore_snapshot(data, self.save_path):
+            self.status_label.setText(f"Restored #{snapshot_id} (save to keep it)")
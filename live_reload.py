@@ -0,0 +1,160 @@
+import json
+from pathlib import Path
+from PySide6.QtCore import QObject, QThread, QTimer, Signal, QFileSystemWatcher
+from save_codecs import decode_save, content_hash, serialize_data
+from data_diff import diff_values
+
+RELOAD_DELAY_MS = 500
+
+
+class ReloadResult:
+    def __init__(self, path, generation, json_data, data_hash, changes, local_paths):
+        self.path = path
+        self.generation = generation
+        self.json_data = json_data
+        self.data_hash = data_hash
+        self.changes = changes
+        self.local_paths = local_paths
+
+
+class ReloadWorker(QThread):
+    reloaded = Signal(object)
+    error_occurred = Signal(str)
+
+    def __init__(self, path, generation, base_json, known_hashes, local_json=None):
+        super().__init__()
+        self.path = path
+        self.generation = generation
+        self.base_json = base_json
+        self.known_hashes = known_hashes
+        self.local_json = local_json
+
+    def run(self):
+        try:
+            with open(self.path, "rb") as f:
+                raw_data = f.read()
+            _, decompressed = decode_save(raw_data, self.path)
+            data = json.loads(decompressed)
+            json_data = serialize_data(data)
+            data_hash = content_hash(json_data)
+            if data_hash in self.known_hashes:
+                return
+
+            base = json.loads(self.base_json)
+            changes = list(diff_values(base, data))
+            local_paths = []
+            if self.local_json is not None:
+                local_paths = [path for path, _, _ in diff_values(base, json.loads(self.local_json))]
+
+            self.reloaded.emit(ReloadResult(
+                self.path, self.generation, json_data, data_hash, changes, local_paths
+            ))
+        except Exception as e:
+            self.error_occurred.emit(f"Reload of {Path(self.path).name} failed: {str(e)}")
+
+
+class SaveFileWatcher(QObject):
+    file_changed = Signal(str)
+    folder_changed = Signal(list)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.fileChanged.connect(self.on_file_changed)
+        self.watcher.directoryChanged.connect(self.on_directory_changed)
+        self.file_path = None
+        self.file_dir = None
+        self.folder_path = None
+        self._folder_mtimes = {}
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(RELOAD_DELAY_MS)
+        self._timer.timeout.connect(self.emit_file_changed)
+
+    def watch_file(self, path):
+        self.unwatch_file()
+        self.file_path = str(Path(path))
+        # The parent folder stays watched too, so a save that is renamed away
+        # and written again (as MZ does) is picked up once it reappears.
+        self.file_dir = str(Path(path).parent)
+        if self.file_dir not in self.watcher.directories():
+            self.watcher.addPath(self.file_dir)
+        self.rewatch_file()
+
+    def unwatch_file(self):
+        self._timer.stop()
+        if self.file_path and self.file_path in self.watcher.files():
+            self.watcher.removePath(self.file_path)
+        if self.file_dir and self.file_dir != self.folder_path and self.file_dir in self.watcher.directories():
+            self.watcher.removePath(self.file_dir)
+        self.file_path = None
+        self.file_dir = None
+
+    def rewatch_file(self):
+        if self.file_path and self.file_path not in self.watcher.files() and Path(self.file_path).exists():
+            self.watcher.addPath(self.file_path)
+            return True
+        return False
+
+    def watch_folder(self, path):
+        self.unwatch_folder()
+        if not Path(path).is_dir():
+            return
+        self.folder_path = str(Path(path))
+        self._folder_mtimes = self.scan_folder()
+        if self.folder_path not in self.watcher.directories():
+            self.watcher.addPath(self.folder_path)
+        self.watch_slots(self._folder_mtimes)
+
+    def unwatch_folder(self):
+        if self.folder_path and self.folder_path != self.file_dir and self.folder_path in self.watcher.directories():
+            self.watcher.removePath(self.folder_path)
+        slots = [p for p in self._folder_mtimes if p != self.file_path and p in self.watcher.files()]
+        if slots:
+            self.watcher.removePaths(slots)
+        self.folder_path = None
+        self._folder_mtimes = {}
+
+    def watch_slots(self, paths):
+        missing = [p for p in paths if p not in self.watcher.files()]
+        if missing:
+            self.watcher.addPaths(missing)
+
+    def scan_folder(self):
+        mtimes = {}
+        for path in Path(self.folder_path).iterdir():
+            if path.suffix.lower() in (".rpgsave", ".rmmzsave"):
+                try:
+                    mtimes[str(path)] = path.stat().st_mtime_ns
+                except OSError:
+                    pass
+        return mtimes
+
+    def on_file_changed(self, path):
+        # Writers that replace the file instead of rewriting it drop the watch.
+        if path not in self.watcher.files() and Path(path).exists():
+            self.watcher.addPath(path)
+        if path == self.file_path:
+            self._timer.start()
+        elif self.folder_path:
+            self.on_directory_changed(self.folder_path)
+
+    def on_directory_changed(self, path):
+        if self.rewatch_file():
+            self._timer.start()
+        if not self.folder_path:
+            return
+        mtimes = self.scan_folder()
+        changed = sorted(p for p, mtime in mtimes.items() if self._folder_mtimes.get(p) != mtime)
+        self._folder_mtimes = mtimes
+        self.watch_slots(mtimes)
+        if self.file_path in changed:
+            self._timer.start()
+        changed = [p for p in changed if p != self.file_path]
+        if changed:
+            self.folder_changed.emit(changed)
+
+    def emit_file_changed(self):
+        if self.file_path:
+            self.rewatch_file()
+            self.file_changed.emit(self.file_path)
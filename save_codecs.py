@@ -0,0 +1,155 @@
+import os
+import json
+import zlib
+import shutil
+import hashlib
+from pathlib import Path
+from lzstring import LZString
+
+SNIFF_SIZE = 64
+BASE64_CHARS = frozenset(b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/=\r\n")
+
+
+class SaveCodec:
+    name = ""
+    description = ""
+    extensions = ()
+
+    def sniff(self, head):
+        raise NotImplementedError
+
+    def decode(self, raw):
+        raise NotImplementedError
+
+    def encode(self, text):
+        raise NotImplementedError
+
+
+class LZStringCodec(SaveCodec):
+    name = "lzstring-mv"
+    description = "RPG Maker MV Save Files"
+    extensions = (".rpgsave",)
+
+    def __init__(self):
+        self.lz = LZString()
+
+    def sniff(self, head):
+        head = head.lstrip(b"\xef\xbb\xbf")
+        return bool(head) and all(b in BASE64_CHARS for b in head)
+
+    def decode(self, raw):
+        text = raw.decode("utf-8-sig").strip()
+        decompressed = self.lz.decompressFromBase64(text)
+        if not decompressed:
+            raise ValueError("Invalid decompression result")
+        return decompressed
+
+    def encode(self, text):
+        return self.lz.compressToBase64(text).encode("utf-8")
+
+
+class ZlibCodec(SaveCodec):
+    # MZ deflates with pako into a binary string, which Node then writes
+    # out as UTF-8, so bytes >= 0x80 are stored as two-byte sequences.
+    name = "zlib-mz"
+    description = "RPG Maker MZ Save Files"
+    extensions = (".rmmzsave",)
+    level = 1
+
+    def _unwrap(self, raw):
+        try:
+            return raw.decode("utf-8").encode("latin-1")
+        except (UnicodeDecodeError, UnicodeEncodeError):
+            return raw
+
+    def sniff(self, head):
+        try:
+            head = head.decode("utf-8", errors="ignore")[:2].encode("latin-1")
+        except UnicodeEncodeError:
+            return False
+        if len(head) < 2:
+            return False
+        cmf, flg = head[0], head[1]
+        return cmf & 0x0F == 8 and cmf >> 4 <= 7 and (cmf << 8 | flg) % 31 == 0
+
+    def decode(self, raw):
+        try:
+            return zlib.decompress(self._unwrap(raw)).decode("utf-8")
+        except zlib.error as e:
+            raise ValueError(f"Invalid zlib stream: {e}")
+
+    def encode(self, text):
+        compressed = zlib.compress(text.encode("utf-8"), self.level)
+        return compressed.decode("latin-1").encode("utf-8")
+
+
+_codecs = []
+
+
+def register_codec(codec):
+    if any(c.name == codec.name for c in _codecs):
+        raise ValueError(f"Codec '{codec.name}' is already registered")
+    _codecs.append(codec)
+    return codec
+
+
+def registered_codecs():
+    return list(_codecs)
+
+
+def get_codec(name):
+    for codec in _codecs:
+        if codec.name == name:
+            return codec
+    raise KeyError(f"Unknown save codec '{name}'")
+
+
+def detect_codec(raw, path=None):
+    head = raw[:SNIFF_SIZE]
+    for codec in _codecs:
+        if codec.sniff(head):
+            return codec
+
+    if path is not None:
+        suffix = Path(path).suffix.lower()
+        for codec in _codecs:
+            if suffix in codec.extensions:
+                return codec
+
+    raise ValueError("Unrecognized save file format")
+
+
+def decode_save(raw, path=None):
+    codec = detect_codec(raw, path)
+    return codec, codec.decode(raw)
+
+
+def file_dialog_filter():
+    patterns = [f"*{ext}" for codec in _codecs for ext in codec.extensions]
+    filters = [f"RPG Maker Save Files ({' '.join(patterns)})"]
+    for codec in _codecs:
+        filters.append(f"{codec.description} ({' '.join('*' + ext for ext in codec.extensions)})")
+    filters.append("All Files (*)")
+    return ";;".join(filters)
+
+
+def serialize_data(data):
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False)
+
+
+def content_hash(json_data):
+    return hashlib.blake2b(json_data.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def write_save_file(path, codec, json_data):
+    if os.path.exists(path):
+        shutil.copyfile(path, path + ".bak")
+    compressed_data = codec.encode(json_data)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(compressed_data)
+    os.replace(tmp_path, path)
+
+
+register_codec(LZStringCodec())
+register_codec(ZlibCodec())
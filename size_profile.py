@@ -0,0 +1,131 @@
+import json
+import zlib
+from PySide6.QtCore import QThread, Signal
+
+# Subtrees at least this large are compressed on their own to measure their
+# ratio; smaller ones inherit the ratio of their nearest measured ancestor.
+SAMPLE_SIZE = 16 * 1024
+
+
+def scalar_size(value):
+    # Shortcuts for the common cases json.dumps would print unchanged.
+    if value is None or value is True:
+        return 4
+    if value is False:
+        return 5
+    if type(value) is int:
+        return len(str(value))
+    if type(value) is str and value.isascii() and value.isprintable() and '"' not in value and "\\" not in value:
+        return len(value) + 2
+    return len(json.dumps(value, ensure_ascii=False).encode("utf-8"))
+
+
+def format_size(size):
+    for unit in ("B", "KB", "MB"):
+        if size < 1024 or unit == "MB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+class SizeProfile:
+    def __init__(self):
+        # path (tuple of tree keys) -> [serialized bytes, compressed bytes, nodes]
+        self.stats = {}
+
+    @classmethod
+    def compute(cls, data):
+        profile = cls()
+        profile._pending = []
+        profile._measure(data, ())
+        del profile._pending
+        return profile
+
+    def _measure(self, value, path):
+        # Sizes are summed on the way back up. Each measured subtree compresses
+        # only the children that no measured descendant covers, so every byte is
+        # compressed once and its unmeasured nodes are given its ratio.
+        start = len(self._pending)
+        if isinstance(value, dict):
+            children = list(value.items())
+        elif isinstance(value, list):
+            children = [(str(index), child) for index, child in enumerate(value)]
+        else:
+            size = scalar_size(value)
+            self.stats[path] = [size, 0 if path else size, 1]
+            self._pending.append(path)
+            return size, 1
+
+        size, nodes = 2 + max(len(children) - 1, 0), 1
+        sampled_size = sampled_compressed = 0
+        unsampled = []
+        for key, child in children:
+            child_path = path + (key,)
+            child_size, child_nodes = self._measure(child, child_path)
+            if isinstance(value, dict):
+                size += scalar_size(key) + 1
+            size += child_size
+            nodes += child_nodes
+            if self._pending and self._pending[-1] == child_path:
+                unsampled.append((key, child))
+            else:
+                sampled_size += child_size
+                sampled_compressed += self.stats[child_path][1]
+        self.stats[path] = [size, 0, nodes]
+        self._pending.append(path)
+        if size < SAMPLE_SIZE and path:
+            return size, nodes
+
+        if unsampled:
+            part = dict(unsampled) if isinstance(value, dict) else [child for _, child in unsampled]
+            text = json.dumps(part, separators=(',', ':'), ensure_ascii=False).encode("utf-8")
+            ratio = len(zlib.compress(text, 1)) / max(len(text), 1)
+        else:
+            ratio = sampled_compressed / max(sampled_size, 1)
+        for pending_path in self._pending[start:]:
+            entry = self.stats[pending_path]
+            entry[1] = entry[0] * ratio
+        del self._pending[start:]
+        self.stats[path][1] = sampled_compressed + (size - sampled_size) * ratio
+        return size, nodes
+
+    def get(self, path):
+        return self.stats.get(tuple(str(step) for step in path))
+
+    def total(self):
+        return self.stats.get((), [0, 0, 0])
+
+    def update_value(self, path, value):
+        path = tuple(str(step) for step in path)
+        entry = self.stats.get(path)
+        if entry is None or entry[2] != 1 or isinstance(value, (dict, list)):
+            return None
+
+        delta = scalar_size(value) - entry[0]
+        affected = []
+        for depth in range(len(path), -1, -1):
+            ancestor = self.stats.get(path[:depth])
+            if ancestor is None:
+                return None
+            ratio = ancestor[1] / ancestor[0] if ancestor[0] else 1.0
+            ancestor[0] += delta
+            ancestor[1] += delta * ratio
+            affected.append(path[:depth])
+        return affected
+
+
+class ProfileWorker(QThread):
+    finished_profile = Signal(int, object)
+    error_occurred = Signal(str)
+
+    def __init__(self, json_data, generation):
+        super().__init__()
+        self.json_data = json_data
+        self.generation = generation
+
+    def run(self):
+        try:
+            profile = SizeProfile.compute(json.loads(self.json_data))
+        except Exception as e:
+            self.error_occurred.emit(f"Size profile failed: {str(e)}")
+            return
+        self.finished_profile.emit(self.generation, profile)
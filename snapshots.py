@@ -0,0 +1,240 @@
+import os
+import json
+import time
+import zlib
+import hashlib
+import threading
+from pathlib import Path
+from collections import OrderedDict
+from app_paths import data_dir
+from data_diff import MISSING
+from save_codecs import content_hash
+
+# Containers that serialize smaller than this are stored inline in their
+# parent chunk instead of getting a chunk file of their own.
+MIN_CHUNK_SIZE = 512
+# Containers with more entries than this are split into pages, so editing
+# one entry of a large list only rewrites the page that holds it.
+PAGE_SIZE = 64
+# Decoded chunks kept in memory for repeated diffs of the same history.
+NODE_CACHE_SIZE = 256
+
+
+def _dumps(value):
+    return json.dumps(value, separators=(',', ':'), ensure_ascii=False)
+
+
+class Snapshot:
+    def __init__(self, snapshot_id, created, root, size, codec="", label="", data_hash=""):
+        self.id = snapshot_id
+        self.created = created
+        self.root = root
+        self.size = size
+        self.codec = codec
+        self.label = label
+        self.hash = data_hash
+
+    def to_dict(self):
+        return {
+            "id": self.id, "created": self.created, "root": self.root,
+            "size": self.size, "codec": self.codec, "label": self.label, "hash": self.hash
+        }
+
+    @classmethod
+    def from_dict(cls, entry):
+        return cls(entry["id"], entry["created"], entry["root"], entry["size"],
+                   entry.get("codec", ""), entry.get("label", ""), entry.get("hash", ""))
+
+
+class SnapshotStore:
+    def __init__(self, root=None):
+        self.root = Path(root) if root else data_dir("snapshots")
+        self.objects_dir = self.root / "objects"
+        self.slots_dir = self.root / "slots"
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self.slots_dir.mkdir(parents=True, exist_ok=True)
+        self._node_cache = OrderedDict()
+        self._record_lock = threading.Lock()
+
+    def slot_id(self, save_path):
+        resolved = str(Path(save_path).resolve()).lower()
+        return hashlib.sha1(resolved.encode("utf-8")).hexdigest()[:16]
+
+    def _slot_log(self, save_path):
+        return self.slots_dir / f"{self.slot_id(save_path)}.jsonl"
+
+    def _object_path(self, digest):
+        return self.objects_dir / digest[:2] / digest
+
+    def list_snapshots(self, save_path):
+        log_path = self._slot_log(save_path)
+        if not log_path.exists():
+            return []
+        snapshots = []
+        with open(log_path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    snapshots.append(Snapshot.from_dict(json.loads(line)))
+        return snapshots
+
+    def get_snapshot(self, save_path, snapshot_id):
+        for snapshot in self.list_snapshots(save_path):
+            if snapshot.id == snapshot_id:
+                return snapshot
+        raise KeyError(f"Snapshot {snapshot_id} not found")
+
+    def record(self, save_path, json_data, codec="", label=""):
+        # Takes the serialized save so an unchanged one is skipped by its hash
+        # without walking the tree.
+        data_hash = content_hash(json_data)
+        with self._record_lock:
+            snapshots = self.list_snapshots(save_path)
+            if snapshots and snapshots[-1].hash == data_hash:
+                return None
+            root = self._encode(json.loads(json_data), force_chunk=True)[1]
+            if snapshots and snapshots[-1].root == root:
+                return None
+
+            snapshot = Snapshot(
+                snapshots[-1].id + 1 if snapshots else 1,
+                time.time(),
+                root,
+                len(json_data.encode("utf-8")),
+                codec,
+                label,
+                data_hash
+            )
+            log_path = self._slot_log(save_path)
+            if not log_path.exists():
+                with open(self.slots_dir / f"{log_path.stem}.path", "w", encoding="utf-8") as f:
+                    f.write(str(Path(save_path).resolve()))
+            with open(log_path, "a", encoding="utf-8") as f:
+                f.write(_dumps(snapshot.to_dict()) + "\n")
+            return snapshot
+
+    def restore(self, save_path, snapshot_id):
+        snapshot = self.get_snapshot(save_path, snapshot_id)
+        return self._decode(["r", snapshot.root])
+
+    def diff(self, save_path, old_id, new_id):
+        old = self.get_snapshot(save_path, old_id)
+        new = self.get_snapshot(save_path, new_id)
+        yield from self._diff_refs(["r", old.root], ["r", new.root], ())
+
+    def _encode(self, value, force_chunk=False):
+        if isinstance(value, dict):
+            kind, entries = "d", [[key, self._encode(child)] for key, child in value.items()]
+        elif isinstance(value, list):
+            kind, entries = "l", [self._encode(child) for child in value]
+        else:
+            return ["v", value]
+
+        if len(entries) > PAGE_SIZE:
+            pages = [
+                self._store_node([kind, entries[start:start + PAGE_SIZE]])
+                for start in range(0, len(entries), PAGE_SIZE)
+            ]
+            return self._store_node([kind.upper(), pages])
+        return self._store_node([kind, entries], force_chunk)
+
+    def _store_node(self, node, force_chunk=True):
+        text = _dumps(node)
+        if len(text) < MIN_CHUNK_SIZE and not force_chunk:
+            return ["i", node]
+
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        self._write_object(digest, text)
+        return ["r", digest]
+
+    def _write_object(self, digest, text):
+        path = self._object_path(digest)
+        if path.exists():
+            return
+        path.parent.mkdir(exist_ok=True)
+        tmp_path = path.with_name(f"{digest}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(zlib.compress(text.encode("utf-8")))
+        os.replace(tmp_path, path)
+
+    def _read_node(self, digest):
+        node = self._node_cache.get(digest)
+        if node is not None:
+            self._node_cache.move_to_end(digest)
+            return node
+        with open(self._object_path(digest), "rb") as f:
+            node = json.loads(zlib.decompress(f.read()).decode("utf-8"))
+        self._node_cache[digest] = node
+        if len(self._node_cache) > NODE_CACHE_SIZE:
+            self._node_cache.popitem(last=False)
+        return node
+
+    def _resolve(self, ref):
+        kind, payload = ref
+        if kind == "r":
+            return self._read_node(payload)
+        if kind == "i":
+            return payload
+        return None
+
+    def _entries(self, node):
+        if node[0] in ("d", "l"):
+            return node[1]
+        entries = []
+        for page in node[1]:
+            entries.extend(self._resolve(page)[1])
+        return entries
+
+    def _decode(self, ref):
+        node = self._resolve(ref)
+        if node is None:
+            return ref[1]
+        if node[0] in ("d", "D"):
+            return {key: self._decode(child) for key, child in self._entries(node)}
+        return [self._decode(child) for child in self._entries(node)]
+
+    def _diff_refs(self, old_ref, new_ref, path):
+        # Python's == treats 1, 1.0 and True as equal, so inline nodes and
+        # values are compared by their JSON text instead.
+        if old_ref[0] == new_ref[0] == "r":
+            if old_ref[1] == new_ref[1]:
+                return
+        elif _dumps(old_ref) == _dumps(new_ref):
+            return
+        old_node = self._resolve(old_ref)
+        new_node = self._resolve(new_ref)
+        if old_node is None or new_node is None or old_node[0].lower() != new_node[0].lower():
+            yield path, self._decode(old_ref), self._decode(new_ref)
+        elif old_node[0] in ("d", "D"):
+            old_entries = self._entries(old_node)
+            new_entries = self._entries(new_node)
+            old_children = dict(old_entries)
+            new_children = dict(new_entries)
+            for key, child in old_entries:
+                if key in new_children:
+                    yield from self._diff_refs(child, new_children[key], path + (key,))
+                else:
+                    yield path + (key,), self._decode(child), MISSING
+            for key, child in new_entries:
+                if key not in old_children:
+                    yield path + (key,), MISSING, self._decode(child)
+        elif old_node[0] == new_node[0] == "L":
+            old_pages, new_pages = old_node[1], new_node[1]
+            for page in range(max(len(old_pages), len(new_pages))):
+                if page < len(old_pages) and page < len(new_pages) and old_pages[page] == new_pages[page]:
+                    continue
+                old_children = self._resolve(old_pages[page])[1] if page < len(old_pages) else []
+                new_children = self._resolve(new_pages[page])[1] if page < len(new_pages) else []
+                yield from self._diff_lists(old_children, new_children, path, page * PAGE_SIZE)
+        else:
+            yield from self._diff_lists(self._entries(old_node), self._entries(new_node), path)
+
+    def _diff_lists(self, old_children, new_children, path, offset=0):
+        for index in range(max(len(old_children), len(new_children))):
+            child_path = path + (offset + index,)
+            if index >= len(new_children):
+                yield child_path, self._decode(old_children[index]), MISSING
+            elif index >= len(old_children):
+                yield child_path, MISSING, self._decode(new_children[index])
+            else:
+                yield from self._diff_refs(old_children[index], new_children[index], child_path)